@@ -1,6 +1,10 @@
 """Module containing the instanciation of the model(s)"""
 
+import os
+
 import mlflow
+from pandas import read_csv
+from prediction.price_grid import PriceGrid
 
 name = "getaround-model"
 client = mlflow.MlflowClient()
@@ -13,3 +17,8 @@ except BaseException:
     latest = 8
 
 XGBoost_model = mlflow.pyfunc.load_model("./assets/getaround-model/" + str(latest))
+
+# Optional serving mode: precompute the model outputs for the configurations of a csv file.
+price_grid = None
+if os.environ.get("PRICE_GRID_DATA"):
+    price_grid = PriceGrid.build(XGBoost_model, read_csv(os.environ["PRICE_GRID_DATA"]))
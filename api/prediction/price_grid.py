@@ -0,0 +1,232 @@
+"""Module defining a precomputed price grid used to serve the most frequent car configurations.
+
+Every categorical feature and boolean flag of a car is encoded into a single integer key. For each
+key of a known configuration, the model outputs are precomputed over a regular mileage x
+engine_power grid, and requests are answered by bilinear interpolation on those two axes. Cars
+outside of the grid are sent to the model itself.
+"""
+
+import logging
+
+import numpy as np
+from models.rental_price_prediction.input import COLUMNS, DTYPES, cast_dtypes
+from pandas import CategoricalDtype, DataFrame
+
+logger = logging.getLogger(__name__)
+
+CATEGORY_COLUMNS = [k for k, v in DTYPES.items() if isinstance(v, CategoricalDtype)]
+FLAG_COLUMNS = [k for k, v in DTYPES.items() if v == np.dtype("bool")]
+
+
+class PriceGrid:
+    """Lookup table of model predictions for a set of car configurations."""
+
+    def __init__(
+        self,
+        model,
+        rows: np.ndarray,
+        values: np.ndarray,
+        mileage_axis: np.ndarray,
+        engine_power_axis: np.ndarray,
+    ):
+        """Wraps already computed grid values. Use PriceGrid.build to compute them from a model.
+
+        Args:
+            model: The model used to compute the grid, and as a fallback outside of it.
+            rows (np.ndarray): Row of each encoded configuration in values, -1 if not in the grid.
+            values (np.ndarray): Predictions, shaped (configurations, mileage, engine_power).
+            mileage_axis (np.ndarray): Regularly spaced mileage values of the grid.
+            engine_power_axis (np.ndarray): Regularly spaced engine_power values of the grid.
+        """
+        self.model = model
+        self.rows = rows
+        self.values = values
+        self.mileage_axis = mileage_axis
+        self.engine_power_axis = engine_power_axis
+        self.report = {}
+
+    @staticmethod
+    def encode(df: DataFrame) -> np.ndarray:
+        """Encodes the categorical features and flags of each car into a single integer.
+
+        Args:
+            df (DataFrame): Cars, with the dtypes of the model input.
+
+        Returns:
+            np.ndarray: The key of each car, -1 for cars with an unknown category.
+        """
+        keys = np.zeros(len(df), dtype=np.int64)
+        unknown = np.zeros(len(df), dtype=bool)
+
+        for col in CATEGORY_COLUMNS:
+            codes = df[col].cat.codes.to_numpy(dtype=np.int64)
+            unknown |= codes < 0
+            keys = keys * len(DTYPES[col].categories) + codes
+
+        for col in FLAG_COLUMNS:
+            keys = keys * 2 + df[col].to_numpy(dtype=np.int64)
+
+        keys[unknown] = -1
+        return keys
+
+    @staticmethod
+    def key_count() -> int:
+        """Number of distinct keys that PriceGrid.encode can produce."""
+        count = 2 ** len(FLAG_COLUMNS)
+        for col in CATEGORY_COLUMNS:
+            count *= len(DTYPES[col].categories)
+        return count
+
+    @classmethod
+    def build(
+        cls,
+        model,
+        configurations: DataFrame,
+        mileage_steps: int = 12,
+        engine_power_steps: int = 8,
+    ) -> "PriceGrid":
+        """Precomputes the model outputs for the configurations found in a dataframe.
+
+        The numeric axes span the mileage and engine_power ranges of the given cars. The accuracy
+        loss is measured on those same cars, against exact predictions.
+
+        Args:
+            model: A model exposing a predict method that takes a DataFrame.
+            configurations (DataFrame): Cars whose configurations should be served by the grid.
+            mileage_steps (int, optional): Number of points on the mileage axis. Defaults to 12.
+            engine_power_steps (int, optional): Number of points on the engine_power axis.
+                Defaults to 8.
+
+        Returns:
+            PriceGrid: The computed grid, with its report filled.
+        """
+        if mileage_steps < 2 or engine_power_steps < 2:
+            raise ValueError("The grid needs at least 2 steps on each numeric axis.")
+
+        configurations = cast_dtypes(configurations).reset_index(drop=True)
+        keys = cls.encode(configurations)
+        hot_keys, first_index = np.unique(keys, return_index=True)
+        first_index = first_index[hot_keys >= 0]
+        hot_keys = hot_keys[hot_keys >= 0]
+
+        mileage_axis = _regular_axis(configurations["mileage"], mileage_steps)
+        engine_power_axis = _regular_axis(configurations["engine_power"], engine_power_steps)
+
+        # One row per (configuration, mileage, engine_power), in the order of the values array.
+        grid = configurations.iloc[np.repeat(first_index, mileage_steps * engine_power_steps)]
+        mileage, engine_power = np.meshgrid(mileage_axis, engine_power_axis, indexing="ij")
+        grid = grid.assign(
+            mileage=np.tile(mileage.ravel(), len(hot_keys)),
+            engine_power=np.tile(engine_power.ravel(), len(hot_keys)),
+        )[COLUMNS]
+
+        values = (
+            np.asarray(model.predict(grid), dtype=np.float32)
+            .reshape(len(hot_keys), mileage_steps, engine_power_steps)
+        )
+
+        rows = np.full(cls.key_count(), -1, dtype=np.int32)
+        rows[hot_keys] = np.arange(len(hot_keys), dtype=np.int32)
+
+        price_grid = cls(model, rows, values, mileage_axis, engine_power_axis)
+        price_grid.report = price_grid.evaluate(configurations)
+        logger.info("Price grid built: %s", price_grid.report)
+        return price_grid
+
+    def memory_footprint(self) -> int:
+        """Size of the lookup arrays, in bytes."""
+        return (
+            self.rows.nbytes
+            + self.values.nbytes
+            + self.mileage_axis.nbytes
+            + self.engine_power_axis.nbytes
+        )
+
+    def evaluate(self, df: DataFrame) -> dict:
+        """Compares the grid with exact model predictions.
+
+        Args:
+            df (DataFrame): Cars, with the dtypes of the model input.
+
+        Returns:
+            dict: Size of the grid, coverage of the given cars and errors on the covered ones.
+        """
+        approximated, in_grid = self.lookup(df)
+        exact = np.asarray(self.model.predict(df[in_grid]), dtype=np.float64)
+        errors = np.abs(approximated[in_grid] - exact)
+
+        return {
+            "configurations": int(self.values.shape[0]),
+            "grid_points": int(self.values.size),
+            "memory_bytes": int(self.memory_footprint()),
+            "coverage": float(in_grid.mean()) if len(df) else 0.0,
+            "mae": float(errors.mean()) if len(errors) else 0.0,
+            "max_error": float(errors.max()) if len(errors) else 0.0,
+        }
+
+    def lookup(self, df: DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        """Interpolates the grid values for each car, without calling the model.
+
+        Args:
+            df (DataFrame): Cars, with the dtypes of the model input.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The interpolated prices, and a mask of the cars that are
+                inside the grid. Prices of cars outside of the grid are NaN.
+        """
+        keys = self.encode(df)
+        rows = np.where(keys >= 0, self.rows[np.maximum(keys, 0)], -1)
+
+        # Fractional positions on each numeric axis. Axes are regular so this is O(1) per car.
+        mileage = _axis_position(df["mileage"], self.mileage_axis)
+        engine_power = _axis_position(df["engine_power"], self.engine_power_axis)
+
+        in_grid = (
+            (rows >= 0)
+            & (mileage >= 0)
+            & (mileage <= len(self.mileage_axis) - 1)
+            & (engine_power >= 0)
+            & (engine_power <= len(self.engine_power_axis) - 1)
+        )
+
+        prices = np.full(len(df), np.nan)
+        rows, mileage, engine_power = rows[in_grid], mileage[in_grid], engine_power[in_grid]
+
+        i = np.minimum(mileage.astype(np.int64), len(self.mileage_axis) - 2)
+        j = np.minimum(engine_power.astype(np.int64), len(self.engine_power_axis) - 2)
+        u = mileage - i
+        v = engine_power - j
+
+        prices[in_grid] = (
+            self.values[rows, i, j] * (1 - u) * (1 - v)
+            + self.values[rows, i + 1, j] * u * (1 - v)
+            + self.values[rows, i, j + 1] * (1 - u) * v
+            + self.values[rows, i + 1, j + 1] * u * v
+        )
+        return prices, in_grid
+
+    def predict(self, df: DataFrame) -> np.ndarray:
+        """Estimates the rental prices, falling back to the model for cars outside of the grid.
+
+        Args:
+            df (DataFrame): Cars, with the dtypes of the model input.
+
+        Returns:
+            np.ndarray: The estimated rental prices.
+        """
+        prices, in_grid = self.lookup(df)
+        if not in_grid.all():
+            prices[~in_grid] = self.model.predict(df[~in_grid])
+        return prices
+
+
+def _regular_axis(values, steps: int) -> np.ndarray:
+    """Builds an integer axis of regularly spaced points covering the given values."""
+    low, high = int(values.min()), int(values.max())
+    step = max(1, -(-(high - low) // (steps - 1)))  # Ceiling division, so the axis covers high.
+    return low + step * np.arange(steps, dtype=np.int64)
+
+
+def _axis_position(values, axis: np.ndarray) -> np.ndarray:
+    """Fractional index of each value on a regular axis."""
+    return (values.to_numpy(dtype=np.float64) - axis[0]) / (axis[1] - axis[0])
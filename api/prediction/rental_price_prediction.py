@@ -1,7 +1,7 @@
 """Module defining where predictions are made."""
 
 from pandas import DataFrame
-from prediction.model import XGBoost_model
+from prediction.model import XGBoost_model, price_grid
 
 
 def prediction(input: DataFrame) -> list[float]:
@@ -13,4 +13,15 @@ def prediction(input: DataFrame) -> list[float]:
     Returns:
         list[float]: The estimated rental prices for the given vehicles.
     """
+    if price_grid is not None:
+        return price_grid.predict(input).tolist()
     return XGBoost_model.predict(input).tolist()
+
+
+def price_grid_report() -> dict | None:
+    """Give the memory footprint and accuracy loss of the price grid, if it is enabled.
+
+    Returns:
+        dict | None: The report computed when the grid was built, None if the grid is disabled.
+    """
+    return None if price_grid is None else price_grid.report
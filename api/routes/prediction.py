@@ -1,6 +1,6 @@
 """Module defining the 'prediction' router."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 from models.rental_price_prediction.input import RentalPriceInput
 from prediction import rental_price_prediction
 
@@ -22,3 +22,16 @@ async def make_prediction(input_json: RentalPriceInput) -> list[float]:
         list[float]: The corresponding list of rental prices estimations.
     """
     return rental_price_prediction.prediction(input_json.cast_to_dataframe())
+
+
+@router.get("/grid", response_model=dict)
+async def get_price_grid_report() -> dict:
+    """Price grid report endpoint.
+
+    Returns:
+        dict: The memory footprint of the price grid and its accuracy loss against the model.
+    """
+    report = rental_price_prediction.price_grid_report()
+    if report is None:
+        raise HTTPException(status_code=404, detail="The price grid is not enabled.")
+    return report